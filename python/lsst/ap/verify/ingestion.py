@@ -31,8 +31,8 @@ __all__ = ["Gen3DatasetIngestConfig", "ingestDatasetGen3"]
 
 import fnmatch
 import os
+import re
 import shutil
-from glob import glob
 import logging
 
 import lsst.utils
@@ -304,13 +304,18 @@ def _findMatchingFiles(basePath, include, exclude=None):
         The files in ``basePath`` or any subdirectory that match ``include``
         but not ``exclude``.
     """
-    _exclude = exclude if exclude is not None else []
+    _include = [re.compile(fnmatch.translate(pattern)) for pattern in include]
+    _exclude = [re.compile(fnmatch.translate(pattern)) for pattern in exclude] \
+        if exclude is not None else []
 
     allFiles = set()
-    for pattern in include:
-        allFiles.update(glob(os.path.join(basePath, '**', pattern), recursive=True))
-
-    for pattern in _exclude:
-        excludedFiles = [f for f in allFiles if fnmatch.fnmatch(os.path.basename(f), pattern)]
-        allFiles.difference_update(excludedFiles)
+    for dirPath, dirNames, fileNames in os.walk(basePath, followlinks=True):
+        # Like glob, ignore hidden files and directories
+        dirNames[:] = [d for d in dirNames if not d.startswith('.')]
+        for fileName in fileNames:
+            if fileName.startswith('.'):
+                continue
+            if any(regex.match(fileName) for regex in _include) \
+                    and not any(regex.match(fileName) for regex in _exclude):
+                allFiles.add(os.path.join(dirPath, fileName))
     return allFiles
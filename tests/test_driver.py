@@ -54,20 +54,27 @@ class PipelineDriverTestSuiteGen3(DataTestCase):
 
         cls.dataset = Dataset(cls.testDataset)
 
+        # Repository setup dominates test time, and the pipeline itself is
+        # mocked, so prepare the inputs once and give each test a copy.
+        cls._templateDir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls._templateDir, ignore_errors=True)
+        workspace = WorkspaceGen3(cls._templateDir)
+        cls.dataset.makeCompatibleRepoGen3(workspace.repo)
+        raws = [os.path.join(cls.dataset.rawLocation, "lsst_a_204595_R11_S01_i.fits")]
+        rawIngest = RawIngestTask(butler=workspace.workButler, config=RawIngestTask.ConfigClass())
+        rawIngest.run(raws, run=None)
+        defineVisit = DefineVisitsTask(butler=workspace.workButler,
+                                       config=DefineVisitsTask.ConfigClass())
+        defineVisit.run(workspace.workButler.registry.queryDataIds("exposure", datasets="raw"))
+
     def setUp(self):
         super().setUp()
 
         self._testDir = tempfile.mkdtemp()
         self.addCleanup(shutil.rmtree, self._testDir, ignore_errors=True)
+        shutil.copytree(self._templateDir, self._testDir, symlinks=True, dirs_exist_ok=True)
 
         self.workspace = WorkspaceGen3(self._testDir)
-        self.dataset.makeCompatibleRepoGen3(self.workspace.repo)
-        raws = [os.path.join(self.dataset.rawLocation, "lsst_a_204595_R11_S01_i.fits")]
-        rawIngest = RawIngestTask(butler=self.workspace.workButler, config=RawIngestTask.ConfigClass())
-        rawIngest.run(raws, run=None)
-        defineVisit = DefineVisitsTask(butler=self.workspace.workButler,
-                                       config=DefineVisitsTask.ConfigClass())
-        defineVisit.run(self.workspace.workButler.registry.queryDataIds("exposure", datasets="raw"))
         self.apPipeArgs = pipeline_driver.ApPipeParser().parse_args(["--pipeline", "foo.yaml"])
 
     def _getArgs(self, call_args):
@@ -21,6 +21,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 
+import concurrent.futures
 import os
 import pickle
 import shutil
@@ -42,8 +43,11 @@ class IngestionTestSuiteGen3(DataTestCase):
         super().setUpClass()
 
         cls.dataset = Dataset(cls.testDataset)
+        cls.rawLocation = cls.dataset.rawLocation
 
-        cls.INSTRUMENT = cls.dataset.instrument.getName()
+        # Dataset.instrument creates a new Butler on every call
+        cls.instrument = cls.dataset.instrument
+        cls.INSTRUMENT = cls.instrument.getName()
         cls.VISIT_ID = 204595
         cls.DETECTOR_ID = 37
 
@@ -51,6 +55,7 @@ class IngestionTestSuiteGen3(DataTestCase):
                         'exposure': cls.VISIT_ID, 'detector': cls.DETECTOR_ID,
                         'instrument': cls.INSTRUMENT},
                        ]
+        cls.rawFiles = [os.path.join(cls.rawLocation, datum['file']) for datum in cls.rawData]
 
         cls.calibData = [{'type': 'bias', 'file': 'bias-R11-S01-det037_2022-01-01.fits.gz',
                           'detector': cls.DETECTOR_ID, 'instrument': cls.INSTRUMENT},
@@ -59,9 +64,24 @@ class IngestionTestSuiteGen3(DataTestCase):
                           'physical_filter': 'i_sim_1.4'},
                          ]
 
+        # Frozen, so safe to share among tests
+        cls.config = cls.makeTestConfig()
+        cls.config.validate()
+        cls.config.freeze()
+
+        # Deleting each test's repository need not delay the next test
+        cls._cleanupPool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        cls.addClassCleanup(cls._cleanupPool.shutdown, wait=True)
+
+        # Importing the preloaded repository dominates setup time, so do it
+        # once and give each test a copy.
+        cls._templateRoot = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls._templateRoot, ignore_errors=True)
+        cls.dataset.makeCompatibleRepoGen3(WorkspaceGen3(cls._templateRoot).repo)
+
     @classmethod
     def makeTestConfig(cls):
-        instrument = cls.dataset.instrument
+        instrument = cls.instrument
         config = ingestion.Gen3DatasetIngestConfig()
         instrument.applyConfigOverrides(ingestion.Gen3DatasetIngestTask._DefaultName, config)
         return config
@@ -69,12 +89,9 @@ class IngestionTestSuiteGen3(DataTestCase):
     def setUp(self):
         super().setUp()
 
-        self.config = self.makeTestConfig()
-        self.config.validate()
-        self.config.freeze()
-
         self.root = tempfile.mkdtemp()
-        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.addCleanup(self._cleanupPool.submit, shutil.rmtree, self.root, ignore_errors=True)
+        shutil.copytree(self._templateRoot, self.root, symlinks=True, dirs_exist_ok=True)
         self.workspace = WorkspaceGen3(self.root)
         self.task = ingestion.Gen3DatasetIngestTask(config=self.config,
                                                     dataset=self.dataset, workspace=self.workspace)
@@ -107,23 +124,21 @@ class IngestionTestSuiteGen3(DataTestCase):
     def testDataIngest(self):
         """Test that ingesting science images given specific files adds them to a repository.
         """
-        files = [os.path.join(self.dataset.rawLocation, datum['file']) for datum in self.rawData]
-        self.task._ingestRaws(files, processes=1)
-        self.assertIngestedDataFiles(self.rawData, self.dataset.instrument.makeDefaultRawIngestRunName())
+        self.task._ingestRaws(self.rawFiles, processes=1)
+        self.assertIngestedDataFiles(self.rawData, self.instrument.makeDefaultRawIngestRunName())
 
     def testDataDoubleIngest(self):
         """Test that re-ingesting science images raises RuntimeError.
         """
-        files = [os.path.join(self.dataset.rawLocation, datum['file']) for datum in self.rawData]
-        self.task._ingestRaws(files, processes=1)
+        self.task._ingestRaws(self.rawFiles, processes=1)
         with self.assertRaises(RuntimeError):
-            self.task._ingestRaws(files, processes=1)
+            self.task._ingestRaws(self.rawFiles, processes=1)
 
     def testDataIngestDriver(self):
         """Test that ingesting science images starting from an abstract dataset adds them to a repository.
         """
         self.task._ensureRaws(processes=1)
-        self.assertIngestedDataFiles(self.rawData, self.dataset.instrument.makeDefaultRawIngestRunName())
+        self.assertIngestedDataFiles(self.rawData, self.instrument.makeDefaultRawIngestRunName())
 
     def testCalibIngestDriver(self):
         """Test that ingesting calibrations starting from an abstract dataset adds them to a repository.
@@ -132,7 +147,7 @@ class IngestionTestSuiteGen3(DataTestCase):
         # queryDatasets cannot (yet) search CALIBRATION collections, so we
         # instead search the RUN-type collections that calibrations are
         # ingested into first before being associated with a validity range.
-        calibrationRunPattern = self.dataset.instrument.makeCollectionName("calib") + "/*"
+        calibrationRunPattern = self.instrument.makeCollectionName("calib") + "/*"
         calibrationRuns = list(
             self.butler.registry.queryCollections(
                 calibrationRunPattern,
@@ -197,6 +212,44 @@ class IngestionTestSuiteGen3(DataTestCase):
         self.assertEqual(self.task.workspace, copy.workspace)
 
 
+class FindMatchingFilesTestSuite(lsst.utils.tests.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        # The tree is never modified, so all test cases can share it
+        cls.root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.root, ignore_errors=True)
+        for subDir in ["sub", os.path.join("sub", "subsub"), ".hidden"]:
+            os.makedirs(os.path.join(cls.root, subDir))
+        for file in ["raw_1.fits",
+                     os.path.join("sub", "raw_2.fits.gz"),
+                     os.path.join("sub", "subsub", "raw_3_bad.fits"),
+                     os.path.join("sub", "notes.txt"),
+                     os.path.join("sub", ".raw_4.fits"),
+                     os.path.join(".hidden", "raw_5.fits"),
+                     ]:
+            open(os.path.join(cls.root, file), "w").close()
+
+    def testFindMatchingFiles(self):
+        """Test that _findMatchingFiles recursively finds files matching
+        ``include`` and not ``exclude``.
+        """
+        cases = [(["raw_*.fits", "*.fits.gz"], None,
+                  {"raw_1.fits",
+                   os.path.join("sub", "raw_2.fits.gz"),
+                   os.path.join("sub", "subsub", "raw_3_bad.fits"),
+                   }),
+                 (["raw_*"], ["*bad*", "*.gz"], {"raw_1.fits"}),
+                 (["*.yaml"], None, set()),
+                 ]
+        for include, exclude, expected in cases:
+            with self.subTest(include=include, exclude=exclude):
+                self.assertEqual(ingestion._findMatchingFiles(self.root, include, exclude=exclude),
+                                 {os.path.join(self.root, file) for file in expected})
+
+
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
     pass
 
@@ -22,7 +22,7 @@
 #
 
 import os
-import shutil
+import pathlib
 import tempfile
 import unittest
 from urllib.request import url2pathname
@@ -35,13 +35,12 @@ from lsst.ap.verify.workspace import WorkspaceGen3
 class WorkspaceGen3TestSuite(lsst.utils.tests.TestCase):
 
     def setUp(self):
+        tempDir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(tempDir.cleanup)
         # Use realpath to avoid link problems
-        self._testWorkspace = os.path.realpath(tempfile.mkdtemp())
+        self._testWorkspace = os.path.realpath(tempDir.name)
         self._testbed = WorkspaceGen3(self._testWorkspace)
 
-    def tearDown(self):
-        shutil.rmtree(self._testWorkspace, ignore_errors=True)
-
     def testRepr(self):
         # Required to match constructor call
         self.assertEqual(repr(self._testbed), "WorkspaceGen3(" + repr(self._testWorkspace) + ")")
@@ -58,31 +57,26 @@ class WorkspaceGen3TestSuite(lsst.utils.tests.TestCase):
     def _assertInDir(self, path, baseDir):
         """Test that ``path`` is a subpath of ``baseDir``.
         """
-        _canonPath = os.path.abspath(os.path.realpath(path))
-        _canonDir = os.path.abspath(os.path.realpath(baseDir))
-        ancestor = os.path.commonprefix([_canonPath, _canonDir])
-        self.assertEqual(ancestor, _canonDir)
+        _canonPath = pathlib.Path(path).resolve()
+        _canonDir = pathlib.Path(baseDir).resolve()
+        self.assertTrue(_canonPath.is_relative_to(_canonDir), f"{path} is not in {baseDir}")
 
     def _assertNotInDir(self, path, baseDir):
         """Test that ``path`` is not a subpath of ``baseDir``.
         """
-        _canonPath = os.path.abspath(os.path.realpath(path))
-        _canonDir = os.path.abspath(os.path.realpath(baseDir))
-        ancestor = os.path.commonprefix([_canonPath, _canonDir])
-        self.assertNotEqual(ancestor, _canonDir)
+        _canonPath = pathlib.Path(path).resolve()
+        _canonDir = pathlib.Path(baseDir).resolve()
+        self.assertFalse(_canonPath.is_relative_to(_canonDir), f"{path} is in {baseDir}")
 
     def testMakeDir(self):
         """Verify that a Workspace creates the workspace directory if it does not exist.
         """
-        newPath = '_temp3'  # can't use mkdtemp because creation is what we're testing
-        shutil.rmtree(newPath, ignore_errors=True)
+        # can't use mkdtemp because creation is what we're testing
+        newPath = os.path.join(self._testWorkspace, '_temp3')
         self.assertFalse(os.path.exists(newPath), 'Workspace directory must not exist before test.')
 
-        try:
-            WorkspaceGen3(newPath)
-            self.assertTrue(os.path.exists(newPath), 'Workspace directory must exist.')
-        finally:
-            shutil.rmtree(newPath, ignore_errors=True)
+        WorkspaceGen3(newPath)
+        self.assertTrue(os.path.exists(newPath), 'Workspace directory must exist.')
 
     def testDirectories(self):
         """Verify that a WorkspaceGen3 creates subdirectories in the target directory.